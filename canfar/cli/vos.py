@@ -4,26 +4,32 @@ from __future__ import annotations
 
 import errno
 import glob
+import hashlib
 import logging
 import math
 import os
 import re
 import sys
 import time
-from typing import Annotated
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Annotated, ClassVar
 from urllib.parse import urlparse
 
 import typer
-import vos
 from cadcutils import exceptions
-from vos import md5_cache
-from vos.vos import CADC_GMS_PREFIX, SortNodeProperty, convert_vospace_time_to_seconds
+from pydantic import PrivateAttr
 
 from canfar import get_logger, set_log_level
 from canfar.client import HTTPClient
+from canfar.hooks.httpx import auth
 from canfar.hooks.typer.aliases import AliasGroup
 from canfar.utils.console import console
 
+if TYPE_CHECKING:
+    # vos pulls in the registry/XML stack, so it is only imported when a
+    # command actually talks to VOSpace
+    from canfar.utils.vospace import Client
+
 log = get_logger(__name__)
 
 
@@ -36,6 +42,18 @@ vos_cli = typer.Typer(
 )
 
 
+def _vospace_host():
+    """Get the VOSpace host override, as resolved by vos itself.
+
+    Returns:
+        str: VOSPACE_WEBSERVICE, else LOCAL_VOSPACE_WEBSERVICE, else ''
+    """
+    host = os.environ.get('VOSPACE_WEBSERVICE')
+    if host is None:
+        host = os.environ.get('LOCAL_VOSPACE_WEBSERVICE', '')
+    return host
+
+
 class VOSpaceClient(HTTPClient):
     """VOSpace client that inherits authentication from HTTPClient.
 
@@ -43,33 +61,93 @@ class VOSpaceClient(HTTPClient):
     to create an authenticated vos.Client instance.
     """
 
-    def __init__(self, **kwargs):
-        """Initialize VOSpaceClient with HTTPClient authentication."""
-        super().__init__(**kwargs)
-        self._vos_client = None
+    # vos.Client instances shared by all VOSpaceClients in the process,
+    # keyed by (VOSpace host, sha256 of refresh or access token)
+    _shared_clients: ClassVar[dict[tuple[str, str], Client]] = {}
+
+    # Private attributes
+    _vos_client: Client | None = PrivateAttr(default=None)
 
     @property
-    def vos_client(self) -> vos.Client:
+    def vos_client(self) -> Client:
         """Get or create authenticated vos.Client instance.
 
+        Clients are shared across VOSpaceClient instances that use the same
+        VOSpace host and login. An expired OIDC access token is refreshed first,
+        and a new access token is swapped into the shared client in place.
+
         Returns:
             vos.Client: Authenticated VOSpace client using the active context's token.
         """
-        if self._vos_client is None:
-            # Extract token from active authentication context
-            ctx = self.config.context
+        # Refresh an expired OIDC access token before handing it to vos
+        auth.renew(self)
 
-            # Get access token based on auth mode
-            if hasattr(ctx, 'token') and ctx.token:
-                token = ctx.token.access
-            else:
-                # Fallback for X509 or other auth modes
-                token = None
+        # Get access token based on auth mode (X509 contexts have none)
+        token = getattr(self.config.context, 'token', None)
+        access = token.access if token else None
 
-            self._vos_client = vos.Client(vospace_token=token)
+        if self._vos_client is None:
+            # Reuse an existing client for the same host and login; the refresh
+            # token outlives access token rollovers, so prefer it in the key
+            identity = (token.refresh or access) if token else None
+            key = (
+                _vospace_host(),
+                hashlib.sha256(identity.encode()).hexdigest() if identity else '',
+            )
+            client = type(self)._shared_clients.get(key)
+            if client is None:
+                from canfar.utils.vospace import Client
+
+                client = Client(vospace_token=access)
+                type(self)._shared_clients[key] = client
+            self._vos_client = client
+
+        if access and self._vos_client.vospace_token != access:
+            # Keep the resolved endpoints and sessions, only swap the token
+            self._vos_client.set_token(access)
 
         return self._vos_client
 
+    def copy_many(self, pairs, parallelism=8, head=False):
+        """Copy several files concurrently.
+
+        Args:
+            pairs: List of (source, destination) tuples
+            parallelism: Maximum number of concurrent transfers
+            head: Copy only the headers of files from VOSpace
+
+        Returns:
+            list: The exception raised for each pair (None on success), in order
+
+        Raises:
+            ValueError: If two pairs write to the same destination
+        """
+        client = self.vos_client
+
+        destinations = [dst for _, dst in pairs]
+        if len(set(destinations)) != len(destinations):
+            raise ValueError("Destinations of concurrent copies must be unique")
+
+        # Resolve endpoints on this thread, so that worker threads share them
+        # instead of racing to create their own; vos resolves the service of
+        # every remote file it checks
+        for src, dst in pairs:
+            client.is_remote_file(src)
+            client.is_remote_file(dst)
+
+        executor = ThreadPoolExecutor(max_workers=parallelism)
+        try:
+            futures = [
+                executor.submit(client.copy, src, dst, head=head) for src, dst in pairs
+            ]
+            wait(futures)
+        except KeyboardInterrupt:
+            # Drop the queued copies instead of waiting for all of them to run
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        return [future.exception() for future in futures]
+
 
 # Global flag for human-readable sizes (used by formatting functions)
 _human_readable = False
@@ -118,12 +196,26 @@ def _date_format(epoch):
     return time.strftime('%b %d %H:%M ', time_tuple)
 
 
+def _group_format(value):
+    """Format a group URI for listing.
+
+    Args:
+        value: Group URI, possibly prefixed with CADC_GMS_PREFIX
+
+    Returns:
+        str: Formatted group name
+    """
+    from vos.vos import CADC_GMS_PREFIX
+
+    return f" {value.replace(CADC_GMS_PREFIX, ''):<15}"
+
+
 # Mapping of node properties to formatting functions
 _LIST_FORMATS = {
     'permissions': lambda value: f"{value:<11}",
     'creator': lambda value: f" {value:<20}",
-    'readGroup': lambda value: f" {value.replace(CADC_GMS_PREFIX, ''):<15}",
-    'writeGroup': lambda value: f" {value.replace(CADC_GMS_PREFIX, ''):<15}",
+    'readGroup': _group_format,
+    'writeGroup': _group_format,
     'isLocked': lambda value: f" {['', 'LOCKED'][value == 'true']:<8}",
     'size': _size_format,
     'date': _date_format,
@@ -140,6 +232,8 @@ def _get_sort_key(node, sort):
     Returns:
         Comparable value for sorting
     """
+    from vos.vos import SortNodeProperty, convert_vospace_time_to_seconds
+
     if sort == SortNodeProperty.LENGTH:
         return int(node.props['length'])
     elif sort == SortNodeProperty.DATE:
@@ -217,6 +311,8 @@ def list_files(
     if debug:
         set_log_level("DEBUG")
 
+    from vos.vos import SortNodeProperty
+
     global _human_readable
     _human_readable = human
 
@@ -322,6 +418,10 @@ def copy_files(
         bool,
         typer.Option("--head", help="Copy only the headers of a file from VOSpace"),
     ] = False,
+    parallelism: Annotated[
+        int,
+        typer.Option("--parallelism", min=1, help="Number of files to copy at once"),
+    ] = 8,
     debug: Annotated[
         bool,
         typer.Option("--debug", help="Enable debug logging"),
@@ -335,6 +435,7 @@ def copy_files(
         canfar vos cp myfile.txt vos:/data/
         canfar vos cp vos:/data/*.fits ./local_dir/
         canfar vos cp -i local_dir/ vos:/backup/
+        canfar vos cp --parallelism 16 ./images/ vos:/data/images/
     """
     if debug:
         set_log_level("DEBUG")
@@ -423,6 +524,80 @@ def copy_files(
             else:
                 return glob.glob(pathname)
 
+        def transfer(source_name, destination_name, ignore_arg=False, head_arg=False,
+                     niters=0):
+            """Copy a single file, retrying on transient errors.
+
+            niters counts the attempts already made under --ignore.
+            """
+            while True:
+                try:
+                    log.debug("Starting copy operation")
+                    client.copy(source_name, destination_name, head=head_arg)
+                    log.debug("Copy operation completed")
+                    break
+                except Exception as client_exception:
+                    log.debug(f"Copy exception: {client_exception}")
+                    if getattr(client_exception, 'errno', -1) == 104:
+                        # Connection reset by peer - retry
+                        log.warning(str(client_exception))
+                        Nonlocal.exit_code += getattr(client_exception, 'errno', -1)
+                    elif getattr(client_exception, 'errno', -1) == errno.EIO:
+                        # Retry on IO errors
+                        log.warning(f"{client_exception}: Retrying")
+                        pass
+                    elif ignore_arg:
+                        if niters > 100:
+                            log.error(
+                                f"{client_exception} (skipping after {niters} attempts)")
+                            break
+                        else:
+                            log.error(f"{client_exception} (retrying)")
+                            time.sleep(5)
+                            niters += 1
+                    else:
+                        raise client_exception
+
+        def skip_invalid(os_exception):
+            """Skip a file with an invalid URI, re-raising any other OSError."""
+            log.debug(str(os_exception))
+            if getattr(os_exception, 'errno', -1) == errno.EINVAL:
+                # Not a valid URI, skip
+                log.warning(f"{os_exception}: Skipping")
+                Nonlocal.exit_code += getattr(os_exception, 'errno', -1)
+            else:
+                raise os_exception
+
+        def retry(source_name, destination_name, failure):
+            """Retry a failed concurrent copy the way transfer() would."""
+            # Errors are reported after all sources are walked; point them at
+            # this file rather than the last destination walked
+            nonlocal this_destination
+            this_destination = destination_name
+            niters = 0
+            try:
+                code = getattr(failure, 'errno', -1)
+                if code == 104:
+                    # Connection reset by peer - retry
+                    log.warning(str(failure))
+                    Nonlocal.exit_code += code
+                elif code == errno.EIO:
+                    # Retry on IO errors
+                    log.warning(f"{failure}: Retrying")
+                elif ignore:
+                    log.error(f"{failure} (retrying)")
+                    time.sleep(5)
+                    niters += 1
+                else:
+                    raise failure
+                transfer(source_name, destination_name, ignore, head, niters)
+            except OSError as os_exception:
+                skip_invalid(os_exception)
+
+        # Files waiting to be copied concurrently once all sources are walked,
+        # keyed by destination
+        pending = {}
+
         def copy_file(source_name, destination_name, exclude_arg=None,
                      include_arg=None, interrogate_arg=False, overwrite=False,
                      ignore_arg=False, head_arg=False):
@@ -469,44 +644,18 @@ def copy_files(
 
                     if not skip:
                         console.print(f"{source_name} -> {destination_name}")
-
-                    niters = 0
-                    while not skip:
-                        try:
-                            log.debug("Starting copy operation")
-                            client.copy(source_name, destination_name, head=head_arg)
-                            log.debug("Copy operation completed")
-                            break
-                        except Exception as client_exception:
-                            log.debug(f"Copy exception: {client_exception}")
-                            if getattr(client_exception, 'errno', -1) == 104:
-                                # Connection reset by peer - retry
-                                log.warning(str(client_exception))
-                                Nonlocal.exit_code += getattr(client_exception, 'errno', -1)
-                            elif getattr(client_exception, 'errno', -1) == errno.EIO:
-                                # Retry on IO errors
-                                log.warning(f"{client_exception}: Retrying")
-                                pass
-                            elif ignore_arg:
-                                if niters > 100:
-                                    log.error(
-                                        f"{client_exception} (skipping after {niters} attempts)")
-                                    skip = True
-                                else:
-                                    log.error(f"{client_exception} (retrying)")
-                                    time.sleep(5)
-                                    niters += 1
-                            else:
-                                raise client_exception
+                        if parallelism > 1:
+                            if destination_name in pending:
+                                # Copied one at a time, the last source would win
+                                log.warning(
+                                    f"{destination_name}: Replacing "
+                                    f"{pending[destination_name]} with {source_name}")
+                            pending[destination_name] = source_name
+                        else:
+                            transfer(source_name, destination_name, ignore_arg, head_arg)
 
             except OSError as os_exception:
-                log.debug(str(os_exception))
-                if getattr(os_exception, 'errno', -1) == errno.EINVAL:
-                    # Not a valid URI, skip
-                    log.warning(f"{os_exception}: Skipping")
-                    Nonlocal.exit_code += getattr(os_exception, 'errno', -1)
-                else:
-                    raise
+                skip_invalid(os_exception)
 
         # Main copy loop
         for source_pattern in source:
@@ -574,6 +723,15 @@ def copy_files(
                          include_arg=include, interrogate_arg=interrogate,
                          overwrite=False, ignore_arg=ignore, head_arg=head)
 
+        # Copy queued files concurrently, then retry failures one at a time
+        if pending:
+            pairs = [(src, dst) for dst, src in pending.items()]
+            failures = client_obj.copy_many(pairs, parallelism=parallelism, head=head)
+            for (source_name, destination_name), failure in zip(pairs, failures):
+                if failure is not None:
+                    log.debug(f"Concurrent copy of {source_name} failed: {failure}")
+                    retry(source_name, destination_name, failure)
+
     except KeyboardInterrupt as ke:
         log.info("Received keyboard interrupt. Execution aborted.")
         Nonlocal.exit_code = getattr(ke, 'errno', -1)
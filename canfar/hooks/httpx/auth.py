@@ -52,6 +52,71 @@ class AuthenticationError(Exception):
     """Exception raised when authentication refresh fails."""
 
 
+def renew(client: HTTPClient) -> SecretStr | None:
+    """Refresh the client's OIDC access token if it has expired.
+
+    The refreshed token is stored in the client's configuration, which is then
+    saved to disk.
+
+    Args:
+        client (HTTPClient): The HTTPClient instance.
+
+    Raises:
+        AuthenticationError: If the token refresh fails.
+
+    Returns:
+        SecretStr | None: The new access token, or None if it was not refreshed.
+    """
+    ctx = client.config.context
+    if not isinstance(ctx, OIDC):
+        log.debug("Skipping auth refresh for non-OIDC context.")
+        return None
+
+    # Skip if the access token is not expired
+    if not ctx.expired:
+        log.debug("Skipping auth refresh, access token is not expired.")
+        return None
+
+    if not ctx.valid:
+        log.warning("OIDC context is not valid.")
+        return None
+
+    if not ctx.token.refresh or (
+        ctx.expiry.refresh and ctx.expiry.refresh < time.time()
+    ):
+        log.warning("OIDC refresh token is missing or expired.")
+        return None
+
+    try:
+        log.debug("Starting synchronous OIDC token refresh.")
+        token: SecretStr = oidc.sync_refresh(
+            url=str(ctx.endpoints.token),
+            identity=str(ctx.client.identity),
+            secret=str(ctx.client.secret),
+            token=str(ctx.token.refresh),
+        )
+        log.debug("Synchronous OIDC token refresh successful.")
+
+        # Create a new context with the updated token
+        data = ctx.model_dump()
+        data["token"]["access"] = token.get_secret_value()
+        data["expiry"]["access"] = jwt.expiry(token.get_secret_value())
+        context = OIDC(**data)
+
+        # Update the configuration and save it
+        client.config.contexts[client.config.active] = context
+        client.config.save()
+        log.debug("Authentication refreshed and configuration saved.")
+        log.info("OIDC Access Token Refreshed.")
+
+    except Exception as err:
+        msg = f"Failed to refresh OIDC token: {err}"
+        log.exception(msg)
+        raise AuthenticationError(msg) from err
+
+    return token
+
+
 def refresh(client: HTTPClient) -> Callable[[httpx.Request], None]:
     """Create an authentication refresh hook for httpx clients.
 
@@ -68,58 +133,15 @@ def refresh(client: HTTPClient) -> Callable[[httpx.Request], None]:
         Args:
             request (httpx.Request): The outgoing HTTP request.
         """
-        ctx = client.config.context
-        if not isinstance(ctx, OIDC):
-            log.debug("Skipping auth refresh for non-OIDC context.")
+        token = renew(client)
+        if token is None:
             return
 
-        # Skip if the access token is not expired
-        if not ctx.expired:
-            log.debug("Skipping auth refresh, access token is not expired.")
-            return
-
-        if not ctx.valid:
-            log.warning("OIDC context is not valid.")
-            return
-
-        if not ctx.token.refresh or (
-            ctx.expiry.refresh and ctx.expiry.refresh < time.time()
-        ):
-            log.warning("OIDC refresh token is missing or expired.")
-            return
-
-        try:
-            log.debug("Starting synchronous OIDC token refresh.")
-            token: SecretStr = oidc.sync_refresh(
-                url=str(ctx.endpoints.token),
-                identity=str(ctx.client.identity),
-                secret=str(ctx.client.secret),
-                token=str(ctx.token.refresh),
-            )
-            log.debug("Synchronous OIDC token refresh successful.")
-
-            # Create a new context with the updated token
-            data = ctx.model_dump()
-            data["token"]["access"] = token.get_secret_value()
-            data["expiry"]["access"] = jwt.expiry(token.get_secret_value())
-            context = OIDC(**data)
-
-            # Update the configuration and save it
-            client.config.contexts[client.config.active] = context
-            client.config.save()
-            log.debug("Authentication refreshed and configuration saved.")
-
-            # Update headers
-            header = f"Bearer {token.get_secret_value()}"
-            client.client.headers["Authorization"] = header
-            request.headers["Authorization"] = header
-            log.debug("HTTP request headers updated with new token.")
-            log.info("OIDC Access Token Refreshed.")
-
-        except Exception as err:
-            msg = f"Failed to refresh OIDC token: {err}"
-            log.exception(msg)
-            raise AuthenticationError(msg) from err
+        # Update headers
+        header = f"Bearer {token.get_secret_value()}"
+        client.client.headers["Authorization"] = header
+        request.headers["Authorization"] = header
+        log.debug("HTTP request headers updated with new token.")
 
     return hook
 
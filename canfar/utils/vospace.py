@@ -0,0 +1,131 @@
+"""Shared VOSpace client for the CANFAR CLI."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any
+
+import vos  # type: ignore[import-untyped]
+from requests.adapters import HTTPAdapter
+from vos.vos import HEADER_DELEG_TOKEN  # type: ignore[import-untyped]
+
+from canfar import get_logger
+
+if TYPE_CHECKING:
+    from cadcutils import net  # type: ignore[import-untyped]
+    from vos.vos import EndPoints
+
+log = get_logger(__name__)
+
+
+class Client(vos.Client):  # type: ignore[misc]
+    """vos.Client with pooled HTTP sessions.
+
+    Every VOSpace operation first resolves its URI to the endpoints of a
+    service, which vos caches per resource ID. This client configures the HTTP
+    session of each newly resolved service once. Its access token can be
+    swapped in place when it is refreshed.
+
+    Built against vos 3.7 and cadcutils 1.6: it relies on the private
+    vos.Client._endpoints, _si_client and _get_si_client, and on
+    BaseWsClient._session and _get_session.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._configured: set[str] = set()
+        # vos derives the resource ID inside get_endpoints, so a single lock
+        # keeps concurrent copies from building or configuring the endpoints
+        # of one service, or the storage client, twice
+        self._lock = threading.RLock()
+
+    def get_endpoints(self, uri: str) -> EndPoints:
+        """Get the endpoints of the VOSpace service for a URI.
+
+        Args:
+            uri (str): VOSpace URI, e.g. vos:/data/file.txt
+
+        Returns:
+            EndPoints: Endpoints of the service hosting the URI.
+        """
+        with self._lock:
+            endpoints = super().get_endpoints(uri)
+            if endpoints.resource_id not in self._configured:
+                self._configured.add(endpoints.resource_id)
+                _configure_session(endpoints.conn.ws_client)
+        return endpoints
+
+    def set_token(self, token: str) -> None:
+        """Swap the access token of this client and its resolved services.
+
+        Resolved endpoints, sessions and their connection pools are kept, so a
+        token rollover costs no registry lookups or new TLS handshakes.
+
+        Args:
+            token (str): New access token.
+        """
+        with self._lock:
+            self.vospace_token = token
+            for endpoints in list(self._endpoints.values()):
+                endpoints.conn.vo_token = token
+                _swap_token(endpoints.conn.ws_client, token)
+            if self._si_client is not None:
+                _swap_token(self._si_client, token)
+
+    def _get_si_client(self, uri: str) -> net.BaseDataClient:
+        """Get the storage client that moves file contents, configuring it once.
+
+        Args:
+            uri (str): VOSpace URI of the file being transferred.
+
+        Returns:
+            net.BaseDataClient: Storage client shared by all transfers.
+        """
+        with self._lock:
+            created = self._si_client is None
+            si_client = super()._get_si_client(uri)
+            if created:
+                _configure_session(si_client)
+        return si_client
+
+
+def _swap_token(ws_client: net.BaseWsClient, token: str) -> None:
+    """Swap the access token of a cadcutils web service client in place.
+
+    cadcutils re-applies the session headers, including the delegation token,
+    on every request, but sets the bearer token only when the session is
+    created.
+
+    Args:
+        ws_client (net.BaseWsClient): Client of the service.
+        token (str): New access token.
+    """
+    ws_client.subject.token = token
+    if ws_client.session_headers is not None:
+        ws_client.session_headers[HEADER_DELEG_TOKEN] = token
+    session = ws_client._session  # noqa: SLF001
+    if session is not None:
+        session.token = token
+
+
+def _configure_session(ws_client: net.BaseWsClient) -> None:
+    """Size the HTTP connection pool of a cadcutils web service client.
+
+    The requests defaults keep at most 10 connections per host, fewer than
+    concurrent copies can use, so extra connections would be dropped after
+    each request and re-established with a fresh TLS handshake. This applies
+    both to the VOSpace service sessions and to the storage client session
+    that carries the file contents.
+
+    Args:
+        ws_client (net.BaseWsClient): Client of the service.
+    """
+    try:
+        session = ws_client._get_session()  # noqa: SLF001
+    except Exception as err:  # noqa: BLE001
+        # Let the actual VOSpace operation surface authentication errors
+        log.debug("Unable to configure session for %s: %s", ws_client.resource_id, err)
+        return
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
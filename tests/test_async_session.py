@@ -1,9 +1,9 @@
 """Test the async session."""
 
+import secrets
 from asyncio import sleep
 from time import time
 from unittest.mock import AsyncMock, patch
-from uuid import uuid4
 
 import pytest
 from pydantic import ValidationError
@@ -14,7 +14,13 @@ from canfar.sessions import AsyncSession
 @pytest.fixture(scope="module")
 def name():
     """Return a random name."""
-    return str(uuid4().hex[:7])
+    return secrets.token_hex(4)
+
+
+@pytest.fixture(scope="module")
+def identity() -> list[str]:
+    """Return the IDs of the session created by the ordered tests."""
+    return []
 
 
 @pytest.fixture
@@ -66,9 +72,11 @@ async def test_create_session_invalid(asession: AsyncSession, name: str) -> None
 @pytest.mark.asyncio
 @pytest.mark.order(1)
 @pytest.mark.slow
-async def test_create_session(asession: AsyncSession, name: str) -> None:
+async def test_create_session(
+    asession: AsyncSession, name: str, identity: list[str]
+) -> None:
     """Test creating a session."""
-    identity: list[str] = await asession.create(
+    created: list[str] = await asession.create(
         name=name,
         kind="headless",
         cores=1,
@@ -78,67 +86,69 @@ async def test_create_session(asession: AsyncSession, name: str) -> None:
         replicas=1,
         env={"TEST": "test"},
     )
-    assert len(identity) == 1
-    assert identity[0] != ""
-    pytest.IDENTITY = identity
+    assert len(created) == 1
+    assert created[0] != ""
+    identity[:] = created
 
 
 @pytest.mark.asyncio
 @pytest.mark.order(2)
 @pytest.mark.slow
-async def test_get_succeeded(asession: AsyncSession) -> None:
+async def test_get_succeeded(asession: AsyncSession, identity: list[str]) -> None:
     """Test getting succeeded sessions."""
     limit: float = time() + 60  # 1 minute
     while time() < limit:
         response = await asession.fetch()
         for result in response:
             await sleep(1)
-            if result["id"] == pytest.IDENTITY[0]:
+            if result["id"] == identity[0]:
                 break
 
 
 @pytest.mark.asyncio
 @pytest.mark.order(3)
 @pytest.mark.slow
-async def test_get_logs(asession: AsyncSession) -> None:
+async def test_get_logs(asession: AsyncSession, identity: list[str]) -> None:
     """Test getting logs for a session."""
-    logs = await asession.logs(ids=pytest.IDENTITY)
+    logs = await asession.logs(ids=identity)
     assert logs != ""
-    assert "TEST" in logs[pytest.IDENTITY[0]]
-    no_logs = await asession.logs(ids=pytest.IDENTITY, verbose=True)
+    assert "TEST" in logs[identity[0]]
+    no_logs = await asession.logs(ids=identity, verbose=True)
     assert no_logs is None
 
 
 @pytest.mark.asyncio
 @pytest.mark.order(4)
 @pytest.mark.slow
-async def test_session_events(asession: AsyncSession) -> None:
+async def test_session_events(asession: AsyncSession, identity: list[str]) -> None:
     """Test getting session events."""
     done = False
     limit = time() + 60
     while not done and time() < limit:
         await sleep(1)
-        events = await asession.events(pytest.IDENTITY)
+        events = await asession.events(identity)
         if events:
             done = True
-            assert pytest.IDENTITY[0] in events[0]
+            assert identity[0] in events[0]
     assert done, "No events found for the session."
 
 
 @pytest.mark.asyncio
 @pytest.mark.order(5)
 @pytest.mark.slow
-async def test_delete_session(asession: AsyncSession, name: str) -> None:
+async def test_delete_session(
+    asession: AsyncSession, name: str, identity: list[str]
+) -> None:
     """Test deleting a session."""
     # Delete the session
     done = False
     while not done:
-        info = await asession.info(ids=pytest.IDENTITY)
+        info = await asession.info(ids=identity)
         for status in info:
             if status["status"] == "Completed":
                 done = True
     deletion = await asession.destroy_with(prefix=name)
-    assert deletion == {pytest.IDENTITY[0]: True}
+    assert deletion == {identity[0]: True}
 
 
 @pytest.mark.asyncio
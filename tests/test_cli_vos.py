@@ -0,0 +1,326 @@
+"""Test the VOSpace CLI client."""
+# ruff: noqa: SLF001
+
+from __future__ import annotations
+
+import errno
+import threading
+from unittest.mock import MagicMock, call, patch
+
+import pytest
+from pydantic import AnyHttpUrl, AnyUrl
+from typer.testing import CliRunner
+
+from canfar.cli import vos as vos_cli
+from canfar.cli.main import cli
+from canfar.cli.vos import VOSpaceClient
+from canfar.models.auth import OIDC, Token
+from canfar.models.config import Configuration
+from canfar.models.http import Server
+
+runner = CliRunner()
+
+
+def _oidc_config(access: str, refresh: str = "refresh-token") -> Configuration:
+    """Create a configuration with an OIDC context using the given tokens."""
+    context = OIDC(
+        server=Server(
+            name="Test OIDC",
+            uri=AnyUrl("ivo://test.org/skaha"),
+            url=AnyHttpUrl("https://oidc.example.com"),
+            version="v1",
+        ),
+        token=Token(access=access, refresh=refresh),
+    )
+    return Configuration(active="oidc", contexts={"oidc": context})
+
+
+@pytest.fixture(autouse=True)
+def clear_client_cache():
+    """Ensure each test starts with an empty vos.Client cache."""
+    VOSpaceClient._shared_clients.clear()
+    yield
+    VOSpaceClient._shared_clients.clear()
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Point the CANFAR configuration file at a temporary location."""
+    path = tmp_path / "config.yaml"
+    monkeypatch.setattr("canfar.models.config.CONFIG_PATH", path)
+    return path
+
+
+@pytest.fixture
+def cp_client(config_path):  # noqa: ARG001
+    """Mock the vos.Client used by `canfar vos cp`, treating vos: URIs as remote."""
+    _oidc_config("token-a").save()
+    client = MagicMock(vospace_token="token-a")
+    client.is_remote_file.side_effect = lambda name: name.startswith("vos:")
+    with patch("canfar.utils.vospace.Client", return_value=client):
+        yield client
+
+
+def _local_files(directory, *names: str) -> list[str]:
+    """Create local files to copy and return their paths."""
+    paths = []
+    for name in names:
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(name)
+        paths.append(str(path))
+    return paths
+
+
+def _copy_failing_with(failures: dict[str, list[Exception]]):
+    """Return a copy side effect raising the queued errors of each source."""
+
+    def copy(source, _destination, head=False):  # noqa: ARG001
+        errors = failures.get(source)
+        if errors:
+            raise errors.pop(0)
+
+    return copy
+
+
+@pytest.fixture
+def mock_vos_client():
+    """Mock the shared VOSpace client to prevent registry lookups."""
+    with patch("canfar.utils.vospace.Client") as mock_client:
+        mock_client.side_effect = lambda **kwargs: MagicMock(
+            vospace_token=kwargs["vospace_token"]
+        )
+        yield mock_client
+
+
+def test_vos_client_shared_across_instances(mock_vos_client) -> None:
+    """Test that clients with the same token share one vos.Client."""
+    first = VOSpaceClient(config=_oidc_config("token-a")).vos_client
+    second = VOSpaceClient(config=_oidc_config("token-a")).vos_client
+    assert first is second
+    mock_vos_client.assert_called_once_with(vospace_token="token-a")
+
+
+def test_vos_client_keyed_by_login(mock_vos_client) -> None:
+    """Test that different logins get different vos.Client instances."""
+    first = VOSpaceClient(config=_oidc_config("token-a", "refresh-a")).vos_client
+    second = VOSpaceClient(config=_oidc_config("token-b", "refresh-b")).vos_client
+    assert first is not second
+    assert mock_vos_client.call_count == 2
+
+
+def test_vos_client_swaps_rolled_over_token(mock_vos_client) -> None:
+    """Test that a new access token is swapped into the shared vos.Client."""
+    first = VOSpaceClient(config=_oidc_config("token-a")).vos_client
+    first.set_token.assert_not_called()
+    second = VOSpaceClient(config=_oidc_config("token-b")).vos_client
+    assert first is second
+    first.set_token.assert_called_once_with("token-b")
+    mock_vos_client.assert_called_once_with(vospace_token="token-a")
+
+
+@pytest.mark.usefixtures("mock_vos_client")
+def test_vos_client_refreshes_expired_token() -> None:
+    """Test that an expired access token is refreshed before it is used."""
+    vospace = VOSpaceClient(config=_oidc_config("token-a"))
+    client = vospace.vos_client
+
+    def renew(vospace_client):
+        vospace_client.config.context.token.access = "token-b"
+
+    with patch("canfar.hooks.httpx.auth.renew", side_effect=renew) as mock_renew:
+        assert vospace.vos_client is client
+    mock_renew.assert_called_once_with(vospace)
+    client.set_token.assert_called_once_with("token-b")
+
+
+@pytest.mark.usefixtures("mock_vos_client")
+def test_vos_client_keyed_by_host(monkeypatch) -> None:
+    """Test that a different VOSpace host gets a different vos.Client."""
+    monkeypatch.delenv("LOCAL_VOSPACE_WEBSERVICE", raising=False)
+    monkeypatch.delenv("VOSPACE_WEBSERVICE", raising=False)
+    first = VOSpaceClient(config=_oidc_config("token-a")).vos_client
+    monkeypatch.setenv("VOSPACE_WEBSERVICE", "vos.example.com")
+    second = VOSpaceClient(config=_oidc_config("token-a")).vos_client
+    assert first is not second
+
+
+@pytest.mark.usefixtures("mock_vos_client")
+def test_copy_many_reports_failures_in_order() -> None:
+    """Test that copy_many returns one result per pair, in order."""
+    vospace = VOSpaceClient(config=_oidc_config("token-a"))
+    error = OSError("copy failed")
+    vospace.vos_client.copy.side_effect = [None, error, None]
+    pairs = [
+        ("/tmp/a.txt", "vos:/data/a.txt"),
+        ("/tmp/b.txt", "vos:/data/b.txt"),
+        ("/tmp/c.txt", "vos:/data/c.txt"),
+    ]
+    failures = vospace.copy_many(pairs, parallelism=1)
+    assert failures == [None, error, None]
+    assert vospace.vos_client.copy.call_count == 3
+
+
+@pytest.mark.usefixtures("mock_vos_client")
+def test_copy_many_resolves_services_before_copying() -> None:
+    """Test that every file is checked with vos before the copies start."""
+    vospace = VOSpaceClient(config=_oidc_config("token-a"))
+    client = vospace.vos_client
+    pairs = [
+        ("C:\\data\\a.txt", "vos:/data/a.txt"),
+        ("arc:/projects/b.txt", "/tmp/b.txt"),
+    ]
+    assert vospace.copy_many(pairs, parallelism=1) == [None, None]
+    assert [c[0] for c in client.method_calls] == ["is_remote_file"] * 4 + ["copy"] * 2
+    assert client.is_remote_file.call_args_list[0] == call("C:\\data\\a.txt")
+
+
+@pytest.mark.usefixtures("mock_vos_client")
+def test_copy_many_rejects_duplicate_destinations() -> None:
+    """Test that two copies never write the same destination at once."""
+    vospace = VOSpaceClient(config=_oidc_config("token-a"))
+    pairs = [("/tmp/a/x.txt", "vos:/data/x.txt"), ("/tmp/b/x.txt", "vos:/data/x.txt")]
+    with pytest.raises(ValueError, match="unique"):
+        vospace.copy_many(pairs)
+    vospace.vos_client.copy.assert_not_called()
+
+
+@pytest.mark.usefixtures("mock_vos_client")
+def test_copy_many_interrupt_cancels_queued_copies() -> None:
+    """Test that Ctrl-C stops the copies that have not started yet."""
+    vospace = VOSpaceClient(config=_oidc_config("token-a"))
+    started = threading.Event()
+    release = threading.Event()
+
+    def copy(*_args, **_kwargs):
+        started.set()
+        release.wait(5)
+
+    def interrupt(_futures):
+        started.wait(5)
+        raise KeyboardInterrupt
+
+    vospace.vos_client.copy.side_effect = copy
+    pairs = [(f"/tmp/{i}.txt", f"vos:/data/{i}.txt") for i in range(10)]
+    with (
+        patch("canfar.cli.vos.wait", side_effect=interrupt),
+        pytest.raises(KeyboardInterrupt),
+    ):
+        vospace.copy_many(pairs, parallelism=1)
+    release.set()
+    assert vospace.vos_client.copy.call_count == 1
+
+
+def test_cp_help_lists_parallelism() -> None:
+    """Test that the cp command exposes the --parallelism option."""
+    result = runner.invoke(cli, ["vos", "cp", "--help"])
+    assert result.exit_code == 0
+    assert "--parallelism" in result.output
+
+
+@pytest.mark.parametrize(
+    ("environment", "expected"),
+    [
+        ({}, ""),
+        ({"LOCAL_VOSPACE_WEBSERVICE": "local.example.com"}, "local.example.com"),
+        (
+            {
+                "VOSPACE_WEBSERVICE": "vos.example.com",
+                "LOCAL_VOSPACE_WEBSERVICE": "local.example.com",
+            },
+            "vos.example.com",
+        ),
+    ],
+)
+def test_vospace_host(monkeypatch, environment, expected) -> None:
+    """Test that VOSPACE_WEBSERVICE takes precedence over the local override."""
+    monkeypatch.delenv("VOSPACE_WEBSERVICE", raising=False)
+    monkeypatch.delenv("LOCAL_VOSPACE_WEBSERVICE", raising=False)
+    for name, value in environment.items():
+        monkeypatch.setenv(name, value)
+    assert vos_cli._vospace_host() == expected
+
+
+def test_cp_copies_queued_files_concurrently(cp_client, tmp_path) -> None:
+    """Test that cp queues the files it walks and copies them in one batch."""
+    first, second = _local_files(tmp_path, "a.txt", "b.txt")
+    with patch.object(
+        VOSpaceClient, "copy_many", autospec=True, side_effect=VOSpaceClient.copy_many
+    ) as copy_many:
+        result = runner.invoke(cli, ["vos", "cp", first, second, "vos:/data/"])
+    assert result.exit_code == 0, result.output
+    pairs = [(first, "vos:/data/a.txt"), (second, "vos:/data/b.txt")]
+    assert copy_many.call_args.args[1] == pairs
+    assert sorted(c.args for c in cp_client.copy.call_args_list) == pairs
+
+
+def test_cp_parallelism_one_copies_sequentially(cp_client, tmp_path) -> None:
+    """Test that --parallelism 1 keeps the one-at-a-time copy loop."""
+    first, second = _local_files(tmp_path, "a.txt", "b.txt")
+    with patch.object(VOSpaceClient, "copy_many") as copy_many:
+        result = runner.invoke(
+            cli, ["vos", "cp", "--parallelism", "1", first, second, "vos:/data/"]
+        )
+    assert result.exit_code == 0, result.output
+    copy_many.assert_not_called()
+    assert cp_client.copy.call_args_list == [
+        call(first, "vos:/data/a.txt", head=False),
+        call(second, "vos:/data/b.txt", head=False),
+    ]
+
+
+def test_cp_replaces_queued_copy_to_same_destination(cp_client, tmp_path) -> None:
+    """Test that only the last source is copied to a shared destination."""
+    first, second = _local_files(tmp_path, "a/x.txt", "b/x.txt")
+    result = runner.invoke(cli, ["vos", "cp", first, second, "vos:/data/"])
+    assert result.exit_code == 0, result.output
+    cp_client.copy.assert_called_once_with(second, "vos:/data/x.txt", head=False)
+
+
+@pytest.mark.parametrize(
+    ("error", "exit_code", "attempts"),
+    [
+        (OSError(errno.EIO, "I/O error"), 0, 2),
+        (OSError(104, "Connection reset by peer"), 104, 2),
+        (OSError(errno.EINVAL, "Invalid URI"), errno.EINVAL, 1),
+        (PermissionError(errno.EACCES, "Permission denied"), 1, 1),
+    ],
+)
+def test_cp_retries_failed_queued_copy(
+    cp_client, tmp_path, error, exit_code, attempts
+) -> None:
+    """Test that failed concurrent copies follow the sequential retry rules."""
+    first, second = _local_files(tmp_path, "a.txt", "b.txt")
+    cp_client.copy.side_effect = _copy_failing_with({first: [error]})
+    result = runner.invoke(cli, ["vos", "cp", first, second, "vos:/data/"])
+    assert result.exit_code == exit_code, result.output
+    sources = [c.args[0] for c in cp_client.copy.call_args_list]
+    assert sources.count(first) == attempts
+    assert sources.count(second) == 1
+
+
+def test_cp_ignore_waits_before_retrying_failed_queued_copy(
+    cp_client, tmp_path
+) -> None:
+    """Test that --ignore retries a failed concurrent copy after a pause."""
+    first, second = _local_files(tmp_path, "a.txt", "b.txt")
+    error = PermissionError(errno.EACCES, "Permission denied")
+    cp_client.copy.side_effect = _copy_failing_with({first: [error, error]})
+    with patch("canfar.cli.vos.time.sleep") as sleep:
+        result = runner.invoke(
+            cli, ["vos", "cp", "--ignore", first, second, "vos:/data/"]
+        )
+    assert result.exit_code == 0, result.output
+    assert sleep.call_args_list == [call(5), call(5)]
+    sources = [c.args[0] for c in cp_client.copy.call_args_list]
+    assert sources.count(first) == 3
+
+
+def test_cp_locked_hint_names_failed_destination(cp_client, tmp_path) -> None:
+    """Test that a locked node is reported for the copy that failed."""
+    first, second = _local_files(tmp_path, "a.txt", "b.txt")
+    error = OSError(errno.EPERM, "NodeLocked: vos:/data/a.txt")
+    cp_client.copy.side_effect = _copy_failing_with({first: [error]})
+    result = runner.invoke(cli, ["vos", "cp", first, second, "vos:/data/"])
+    assert result.exit_code == 1
+    assert "before copying to vos:/data/a.txt" in " ".join(result.output.split())
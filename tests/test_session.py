@@ -1,9 +1,9 @@
 """Test Canfar Session API."""
 
+import secrets
 from time import sleep, time
 from typing import Any
 from unittest.mock import patch
-from uuid import uuid4
 
 import pytest
 from pydantic import ValidationError
@@ -11,13 +11,17 @@ from pydantic import ValidationError
 from canfar.models.session import CreateRequest
 from canfar.sessions import Session
 
-pytest.IDENTITY: list[str] = []
-
 
 @pytest.fixture(scope="module")
 def name():
     """Return a random name."""
-    return str(uuid4().hex[:7])
+    return secrets.token_hex(4)
+
+
+@pytest.fixture(scope="module")
+def identity() -> list[str]:
+    """Return the IDs of the session created by the ordered tests."""
+    return []
 
 
 @pytest.fixture(scope="session")
@@ -83,9 +87,9 @@ def test_create_session_cmd_without_headless(session: Session, name: str) -> Non
 
 
 @pytest.mark.slow
-def test_create_session(session: Session, name: str) -> None:
+def test_create_session(session: Session, name: str, identity: list[str]) -> None:
     """Test creating a session."""
-    identity: list[str] = session.create(
+    created: list[str] = session.create(
         name=name,
         kind="headless",
         cores=1,
@@ -95,20 +99,20 @@ def test_create_session(session: Session, name: str) -> None:
         replicas=1,
         env={"TEST": "test"},
     )
-    assert len(identity) == 1
-    assert identity[0] != ""
-    pytest.IDENTITY = identity
+    assert len(created) == 1
+    assert created[0] != ""
+    identity[:] = created
 
 
 @pytest.mark.slow
-def test_get_session_info(session: Session) -> None:
+def test_get_session_info(session: Session, identity: list[str]) -> None:
     """Test getting session info."""
     info: list[dict[str, Any]] = [{}]
     limit = time() + 60  # 1 minute
     success: bool = False
     while time() < limit:
         sleep(1)
-        info = session.info(pytest.IDENTITY)
+        info = session.info(identity)
         if len(info) == 1:
             success = True
             break
@@ -116,44 +120,44 @@ def test_get_session_info(session: Session) -> None:
 
 
 @pytest.mark.slow
-def test_session_logs(session: Session) -> None:
+def test_session_logs(session: Session, identity: list[str]) -> None:
     """Test getting session logs."""
     limit = time() + 60  # 1 minute
     logs: dict[str, str] = {}
     while time() < limit:
         sleep(1)
-        info = session.info(pytest.IDENTITY)
+        info = session.info(identity)
         if info[0]["status"] in ("Succeeded", "Completed"):
-            logs = session.logs(pytest.IDENTITY)
+            logs = session.logs(identity)
     success = False
-    for line in logs[pytest.IDENTITY[0]].split("\n"):
+    for line in logs[identity[0]].split("\n"):
         if "TEST=test" in line:
             success = True
             break
-    session.logs(pytest.IDENTITY, verbose=True)
+    session.logs(identity, verbose=True)
     assert success
 
 
 @pytest.mark.slow
-def test_session_events(session: Session) -> None:
+def test_session_events(session: Session, identity: list[str]) -> None:
     """Test getting session events."""
     limit = time() + 60  # 1 minute
     events: list[dict[str, str]] = []
     while time() < limit:
         sleep(1)
-        events = session.events(pytest.IDENTITY)
+        events = session.events(identity)
         if len(events) > 0:
             break
-    assert pytest.IDENTITY[0] in events[0]
+    assert identity[0] in events[0]
 
 
 @pytest.mark.slow
-def test_delete_session(session: Session, name: str) -> None:
+def test_delete_session(session: Session, name: str, identity: list[str]) -> None:
     """Test deleting a session."""
     # Delete the session
     sleep(10)
     deletion = session.destroy_with(prefix=name)
-    assert deletion == {pytest.IDENTITY[0]: True}
+    assert deletion == {identity[0]: True}
 
 
 def test_destroy_with_regex_match(session: Session) -> None:
@@ -0,0 +1,97 @@
+"""Test the shared VOSpace client."""
+# ruff: noqa: SLF001
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+import vos
+from vos.vos import HEADER_DELEG_TOKEN, EndPoints
+
+from canfar.utils import vospace
+
+
+@pytest.fixture
+def base_get_endpoints():
+    """Mock the vos.Client endpoint lookup to prevent registry lookups."""
+    with patch.object(vos.Client, "get_endpoints") as mock_get_endpoints:
+        mock_get_endpoints.side_effect = lambda uri: MagicMock(
+            resource_id=f"ivo://cadc.nrc.ca/{uri.split(':')[0]}"
+        )
+        yield mock_get_endpoints
+
+
+def test_get_endpoints_delegates_to_vos(base_get_endpoints) -> None:
+    """Test that every lookup goes through the vos endpoint cache."""
+    client = vospace.Client(vospace_token="token")
+    client.get_endpoints("vos:/data/file.txt")
+    client.get_endpoints("vos:/data/other.txt")
+    assert base_get_endpoints.call_count == 2
+
+
+def test_session_configured_once_per_service(base_get_endpoints) -> None:
+    """Test that each service session gets a larger connection pool once."""
+    endpoints = MagicMock(resource_id="ivo://cadc.nrc.ca/vault")
+    base_get_endpoints.side_effect = None
+    base_get_endpoints.return_value = endpoints
+    client = vospace.Client(vospace_token="token")
+    client.get_endpoints("vos:/data/file.txt")
+    client.get_endpoints("vos:/data/other.txt")
+    session = endpoints.conn.ws_client._get_session()
+    assert session.mount.call_count == 2
+    adapter = session.mount.call_args.args[1]
+    assert adapter._pool_maxsize == 32
+
+
+def test_new_client_resolves_nothing(base_get_endpoints) -> None:
+    """Test that a new client makes no lookups and keeps file system semantics."""
+    client = vospace.Client(vospace_token="token")
+    base_get_endpoints.assert_not_called()
+    assert client._fs_type is True
+
+
+@pytest.mark.usefixtures("base_get_endpoints")
+def test_storage_client_session_configured_once() -> None:
+    """Test that the storage client carrying file contents gets the larger pool."""
+    client = vospace.Client(vospace_token="token")
+    si_client = MagicMock()
+
+    def get_si_client(_uri):
+        client._si_client = si_client
+        return si_client
+
+    with patch.object(vos.Client, "_get_si_client", side_effect=get_si_client):
+        client._get_si_client("vos:/data/file.txt")
+        client._get_si_client("vos:/data/other.txt")
+    session = si_client._get_session()
+    assert session.mount.call_count == 2
+    assert session.mount.call_args.args[1]._pool_maxsize == 32
+
+
+def test_set_token_updates_resolved_services(base_get_endpoints, monkeypatch) -> None:
+    """Test that a new token is swapped into the existing sessions in place."""
+    # A host override spares cadcutils the registry lookup for the service
+    monkeypatch.setenv("VOSPACE_WEBSERVICE", "vos.example.com")
+    endpoints = EndPoints("ivo://cadc.nrc.ca/vault", vospace_token="token-a")
+    base_get_endpoints.side_effect = None
+    base_get_endpoints.return_value = endpoints
+    client = vospace.Client(vospace_token="token-a")
+    client.get_endpoints("vos:/data/file.txt")
+    client._endpoints[endpoints.resource_id] = endpoints
+    conn = endpoints.conn
+    session = endpoints.session
+    si_client = MagicMock()
+    client._si_client = si_client
+
+    client.set_token("token-b")
+
+    assert client.vospace_token == "token-b"
+    assert endpoints.conn is conn
+    assert endpoints.session is session
+    assert conn.vo_token == "token-b"
+    assert session.headers["Authorization"] == "Bearer token-b"
+    assert session.headers[HEADER_DELEG_TOKEN] == "token-b"
+    assert session.get_adapter("https://vos.example.com")._pool_maxsize == 32
+    assert client._si_client is si_client
+    assert si_client._session.token == "token-b"